@@ -2,87 +2,150 @@
 Pylint digestor for when pylint output is extremely long
 Classifies most issues via pattern matching and outputs a much more readable summary
 """
+import argparse
+import functools
+import mmap
+import multiprocessing as mp
+import os
 import re
+import stat
 import sys
-from collections import defaultdict, OrderedDict
+import tempfile
+from array import array
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+
+try:  # optional: the third-party `regex` engine matches the rule patterns faster
+    import regex as _rule_re
+    _RULE_FLAGS = _rule_re.I | _rule_re.V1
+except ImportError:
+    _rule_re = re
+    _RULE_FLAGS = re.I
+
+try:  # optional: Hyperscan matches every rule in one pass over the message
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 # Classification rules
-# Each entry is (compiled_regex, canonical_category_name)
+# Each entry is (required_literal, pattern_source, canonical_category_name). Patterns are
+# matched case-insensitively and must stay valid for both `re` and `regex`; the literal is
+# a lowercase substring every match contains.
 RULES = [
     # Whitespace & formatting
-    (re.compile(r"\bTrailing whitespace\b", re.I), "Trailing whitespace"),
-    (re.compile(r"\bLine too long \(\d+/\d+\)", re.I), "Line too long"),
-    (re.compile(r"\bunnecessary pass\b", re.I), "Unnecessary pass statement"),
+    ("trailing whitespace", r"\bTrailing whitespace\b", "Trailing whitespace"),
+    ("line too long", r"\bLine too long \(\d+/\d+\)", "Line too long"),
+    ("unnecessary pass", r"\bunnecessary pass\b", "Unnecessary pass statement"),
 
     # Imports
-    (re.compile(r"\bUnused (?:[\w\.]+ )?import(?:ed)?\b", re.I), "Unused import"),
+    ("unused", r"\bUnused (?:[\w\.]+ )?import(?:ed)?\b", "Unused import"),
 
-    (re.compile(
+    (
+        "placed",
         r'\bimport\s+["\'][^"\']+["\']\s+should\s+be\s+placed\s+at\s+the\s+top\s+of\s+the\s+module',
-        re.I
-    ), "Import order"),
+        "Import order"
+    ),
 
-    (re.compile(
+    (
+        "placed",
         r'\b(?:standard|third\s+party|first\s+party)\s+import'
         r'\s+["\'][^"\']+["\'](?:\s*,\s*["\'][^"\']+["\'])*'
         r'\s+should\s+be\s+placed\s+before\s+'
         r'(?:standard|third\s+party|first\s+party)\s+imports?'
         r'\s+["\'][^"\']+["\'](?:\s*,\s*["\'][^"\']+["\'])*',
-        re.I
-    ), "Import order"),
+        "Import order"
+    ),
 
     # Docs
-    (re.compile(r"Missing (?:function or method|module) docstring", re.I), "Missing docstring"),
+    ("docstring", r"Missing (?:function or method|module) docstring", "Missing docstring"),
 
     # Typing / annotations
-    (re.compile(r"\bFunction is missing a return type annotation\b", re.I), "Missing type annotation"),
-    (re.compile(r"\bFunction is missing a type annotation\b", re.I), "Missing type annotation"),
-    (re.compile(r"\bCall to untyped function\b", re.I), "Missing type annotation"),
-    (re.compile(r"\bIncompatible .* type", re.I), "Type error"),
-    (re.compile(r'"None" has no attribute', re.I), "Type error"),
-    (re.compile(r"Incompatible return value type", re.I), "Type error"),
+    ("annotation", r"\bFunction is missing a return type annotation\b", "Missing type annotation"),
+    ("annotation", r"\bFunction is missing a type annotation\b", "Missing type annotation"),
+    ("untyped function", r"\bCall to untyped function\b", "Missing type annotation"),
+    ("incompatible", r"\bIncompatible .* type", "Type error"),
+    ("has no attribute", r'"None" has no attribute', "Type error"),
+    ("incompatible", r"Incompatible return value type", "Type error"),
 
     # Unresolved / missing modules
-    (re.compile(r"Cannot find implementation or library stub for module named", re.I), "Unresolved module"),
+    ("cannot find implementation", r"Cannot find implementation or library stub for module named", "Unresolved module"),
 
     # Unused vars/args (keep separate from imports)
-    (re.compile(r"\bUnused variable\b", re.I), "Unused variable/argument"),
-    (re.compile(r"\bUnused argument\b", re.I), "Unused variable/argument"),
+    ("unused", r"\bUnused variable\b", "Unused variable/argument"),
+    ("unused", r"\bUnused argument\b", "Unused variable/argument"),
 
     # TODOs (match "TODO", "TODO:", "TODO -", etc.)
-    (re.compile(r"\bTODO\b[:\-]?", re.I), "TODO"),
+    ("todo", r"\bTODO\b[:\-]?", "TODO"),
 
 
     # Complexity limits (too many X)
-    (re.compile(
+    (
+        "too many",
         r"\bToo many (?:local variables|branches|arguments|instance attributes|public methods|statements)\b",
-        re.I
-    ), "Complexity limit"),
+        "Complexity limit"
+    ),
     
     # Naming style
-    (re.compile(
+    (
+        "naming",
         r'\b(?:constant|variable|function|method|class)\s+name\s+["\']?[^"\']+["\']?\s+'
         r'doesn[’\']t\s+conform\s+to\s+(?:\{[^}]+\}|[a-z_-]*case)\s+naming\s+style',
-        re.I
-    ), "Naming style"),
+        "Naming style"
+    ),
     
     # Reassigned Variable
-    (re.compile(r'\bredefining name\s+["\']?[^"\']+["\']?\s+from outer scope\s*\(line\s*\d+\)', re.I), "Redefined name"),
+    ("redefining name", r'\bredefining name\s+["\']?[^"\']+["\']?\s+from outer scope\s*\(line\s*\d+\)', "Redefined name"),
 
 
     # Style / logic smells (grab-bag)
-    (re.compile(r"Using an f-string that does not have any interpolated variables", re.I), "Bad code logic"),
-    (re.compile(r"Consider explicitly re-raising", re.I), "Bad code logic"),
-    (re.compile(r"\bunnecessary else\b", re.I), "Bad code logic"),
+    ("f-string", r"Using an f-string that does not have any interpolated variables", "Bad code logic"),
+    ("re-raising", r"Consider explicitly re-raising", "Bad code logic"),
+    ("unnecessary else", r"\bunnecessary else\b", "Bad code logic"),
 ]
 
-# File block header: "path: N errors:"
-HEADER_RE = re.compile(r"^\s*(?P<file>[^:\n]+):\s*\d+\s+errors?:\s*$", re.I)
-# Entry: "LINE: message"
-ENTRY_RE  = re.compile(r"^\s*(?P<line>\d+):\s*(?P<msg>.+?)\s*$")
+# Rules are tried in this order, most frequent categories in real pylint output first, so
+# the common cases return after one or two checks. The sort is stable (rule order within a
+# category is kept), and the weights keep every pair of categories whose messages can
+# overlap in their original precedence: "Unused import" before "Unused variable/argument",
+# and "TODO" before the rules that quote identifiers which may themselves read "todo".
+RULE_WEIGHTS = {
+    "Line too long": 1,
+    "Trailing whitespace": 2,
+    "Missing docstring": 3,
+    "Missing type annotation": 4,
+    "Unused import": 5,
+    "Type error": 6,
+    "Unused variable/argument": 7,
+    "Import order": 8,
+    "Unresolved module": 9,
+    "TODO": 10,
+    "Naming style": 11,
+    "Redefined name": 12,
+    "Complexity limit": 13,
+    "Unnecessary pass statement": 14,
+    "Bad code logic": 15,
+}
+RULES.sort(key=lambda rule: RULE_WEIGHTS.get(rule[2], 99))
+
+# One pattern per raw (bytes) input line; m.groups() is (file, None, None) for a header
+# and (None, line, msg) for an entry. Line numbers are capped at 18 digits so they always
+# fit the signed 64-bit arrays they are stored in; longer digit runs are treated as noise.
+LINE_RE = re.compile(
+    rb"^\s*(?:(?P<file>[^:\n]+):\s*\d+\s+errors?:\s*$"    # file block header: "path: N errors:"
+    rb"|(?P<line>\d{1,18}):\s*(?P<msg>.+?)\s*$)",          # entry: "LINE: message"
+    re.I
+)
+
+# Inputs with fewer entries than this are summarized in-process; past it, process pool
+# startup is cheap next to the classification work it spreads across cores
+PARALLEL_MIN_ENTRIES = 5000
+# Blocks per task sent to a pool worker, and tasks queued per worker before waiting on results
+PARALLEL_CHUNK = 8
+PARALLEL_WINDOW = 4
 
 # Grouping of issue reports
-PREFERRED_ORDER = [
+PREFERRED_ORDER = (
         "Unused import",
         "Import order",
         "Trailing whitespace",
@@ -96,145 +159,348 @@ PREFERRED_ORDER = [
         "TODO",
         "Naming style",
         "Complexity limit",
-        "Redefined name"
+        "Redefined name",
         "Bad code logic",
-    ]
+    )
 
-def classify(msg: str) -> str | None:
-    for rx, cat in RULES:
-        if rx.search(msg):
-            return cat
-    return None
+# Categories are handled internally as small int ids (indices into CAT_NAMES) and only
+# turned back into names for output. Ids follow PREFERRED_ORDER, with any other rule
+# categories after it alphabetically, so sorting ids sorts categories for display.
+CAT_NAMES = PREFERRED_ORDER + tuple(sorted({cat for _, _, cat in RULES} - set(PREFERRED_ORDER)))
+CAT_ID = {cat: i for i, cat in enumerate(CAT_NAMES)}
 
-def trim_optional_header(lines: list[str]) -> list[str]:
+# Every match contains its rule's literal, so nothing shorter than the shortest one can match
+MIN_MSG_LEN = min(len(lit) for lit, _, _ in RULES)
+
+# Digit runs are folded to "0" before caching: no rule cares which number it sees
+# ("Line too long (123/100)"), so messages differing only in numbers share a cache slot.
+_DIGIT_RE = re.compile(r"\d+")
+
+def classify(msg: str) -> int | None:
+    """Category id of msg (see CAT_NAMES), or None if no rule matches."""
+    if len(msg) < MIN_MSG_LEN:
+        return None
+    return _classifier()(_DIGIT_RE.sub("0", msg))
+
+def _build_classifier():
+    """
+    Generate a flat classifier from RULES: one `if literal in low and search(msg)` per rule,
+    in RULES order, so a call is a straight run of substring tests and C-level searches
+    with no list walking or tuple unpacking. Rules whose literal is absent cost one `in`.
+    """
+    ns = {}
+    src = ["def _classify_key(msg):", "    low = msg.lower()"]
+    for i, (lit, pat, cat) in enumerate(RULES):
+        ns[f"_s{i}"] = _rule_re.compile(pat, _RULE_FLAGS).search
+        src.append(f"    if {lit!r} in low and _s{i}(msg): return {CAT_ID[cat]}")
+    src.append("    return None")
+    exec("\n".join(src), ns)
+    return ns["_classify_key"]
+
+def _build_hyperscan_classifier():
+    """
+    Compile all RULES into one Hyperscan database and classify by scanning the message once.
+    Every rule that matches is reported; the lowest index wins, as in the generated chain.
+    Without UCP, \w and \b are ASCII-only, so non-ASCII messages go to the generated chain.
+    """
+    # No HS_FLAG_UCP: Hyperscan rejects \b in UCP mode, and nearly every rule starts with one
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_SINGLEMATCH
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[pat.encode("utf-8") for _, pat, _ in RULES],
+        ids=list(range(len(RULES))),
+        elements=len(RULES),
+        flags=[flags] * len(RULES),
+    )
+    cat_ids = [CAT_ID[cat] for _, _, cat in RULES]
+    fallback = _build_classifier()
+
+    def _classify_key(msg):
+        if not msg.isascii():
+            return fallback(msg)
+        hits = []
+        db.scan(msg.encode("utf-8"), match_event_handler=lambda rule, *_: hits.append(rule))
+        return cat_ids[min(hits)] if hits else None
+
+    return _classify_key
+
+@functools.cache
+def _classifier():
     """
-    Drop any leading header noise (e.g., "Lint Output", "Total errors: 151", blank lines)
-    until the first file block header line is found.
+    The memoized classifier, compiled on first use and then once per process. Pool workers
+    forked after the parent has called this inherit it; spawned workers build their own.
+    Uses Hyperscan when it is installed and accepts every rule, else the generated chain.
     """
-    i = 0
-    n = len(lines)
-    while i < n and not HEADER_RE.match(lines[i]):
-        i += 1
-    return lines[i:] if i < n else lines  # if no header found, return as-is
+    fn = None
+    if hyperscan is not None:
+        try:
+            fn = _build_hyperscan_classifier()
+        except hyperscan.error as e:
+            if os.environ.get("PYLINT_HELPER_CACHE_STATS"):
+                print(f"hyperscan rejected the rules ({e}); using the generated classifier",
+                      file=sys.stderr)
+    return functools.lru_cache(maxsize=4096)(fn or _build_classifier())
+
+classify.cache_info = lambda: _classifier().cache_info()
+classify.cache_clear = lambda: _classifier().cache_clear()
+
+def mapped_lines(f):
+    """
+    Yield the raw byte lines of binary file f, nothing decoded up front. Regular files go
+    through a read-only memory map so the OS pages the log in lazily (an empty one yields
+    nothing); pipes, FIFOs and other streams are read from f directly. Like text mode's
+    universal newlines, "\r\n" and a lone "\r" also end a line.
+    """
+    st = os.fstat(f.fileno())
+    if not stat.S_ISREG(st.st_mode):
+        yield from _split_cr(f)
+        return
+    if st.st_size == 0:
+        return
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = iter(mm.readline, b"")
+        yield from (lines if mm.find(b"\r") == -1 else _split_cr(lines))
+
+def _split_cr(lines):
+    # Lines were cut on b"\n" only; bytes.splitlines() also cuts on "\r\n" and a lone "\r".
+    # A CR-only file arrives as one line here and is split in memory.
+    for line in lines:
+        if b"\r" in line:
+            yield from line.splitlines()
+        else:
+            yield line
 
 def parse_blocks(lines):
     """
     Yields (filepath, [(line:int, message:str), ...]) for each block.
-    Accepts indented lines and ignores non-matching fluff.
-    """
-    i = 0
-    n = len(lines)
-    while i < n:
-        m = HEADER_RE.match(lines[i])
-        if not m:
-            i += 1
+    Consumes any iterable of UTF-8 byte lines (e.g. mapped_lines()) in a single pass:
+    leading header noise before the first block is skipped, indented lines are accepted
+    and non-matching fluff is ignored. Only matched paths and messages are decoded.
+    """
+    filepath = None
+    entries = []
+    for line in lines:
+        m = LINE_RE.match(line)
+        if m is None:
             continue
-        filepath = m.group("file").strip()
-        i += 1
-        entries = []
-        while i < n and not HEADER_RE.match(lines[i]):
-            e = ENTRY_RE.match(lines[i])
-            if e:
-                entries.append((int(e.group("line")), e.group("msg").strip()))
-            i += 1
+        header, lineno, msg = m.groups()
+        if header is not None:
+            if filepath is not None:
+                yield filepath, entries
+            filepath = sys.intern(header.strip().decode("utf-8"))
+            entries = []
+        elif filepath is not None:
+            entries.append((int(lineno), msg.decode("utf-8")))  # LINE_RE already trims msg
+    if filepath is not None:
         yield filepath, entries
 
-def summarize_entries(entries):
-    """Return (cat -> set(lines), unreconcilables[list of (line,msg)])."""
-    cat_lines = defaultdict(set)
+def summarize_entries(entries, keep_unreconcilable=True):
+    """
+    Return (cat id -> array('q') of ascending unique lines, unreconcilables[list of (line,msg)]).
+    Pylint lists a block's entries by line, so lines are appended as they come and a repeat
+    of the previous line is dropped; an out-of-order block gets one sort at the end.
+    With keep_unreconcilable=False unmatched entries are dropped and the list stays empty.
+    """
+    cat_lines: dict[int, array] = {}
     unreconcilable = []
+    unordered = False
     for line, msg in entries:
         cat = classify(msg)
         if cat is None:
-            unreconcilable.append((line, msg))
-        else:
-            cat_lines[cat].add(line)
+            if keep_unreconcilable:
+                unreconcilable.append((line, msg))
+            continue
+        a = cat_lines.get(cat)
+        if a is None:
+            a = cat_lines[cat] = array("q")
+        elif a[-1] == line:
+            continue
+        elif a[-1] > line:
+            unordered = True
+        a.append(line)
+    if unordered:
+        for cat, a in cat_lines.items():
+            cat_lines[cat] = array("q", sorted(set(a)))
     return cat_lines, unreconcilable
 
-def order_categories(cat_lines_map: dict[str, set[int]]) -> OrderedDict:
-    ordered = OrderedDict()
-    for cat in PREFERRED_ORDER:
-        if cat in cat_lines_map:
-            ordered[cat] = sorted(cat_lines_map[cat])
-    # include any categories not in preferred list
-    for cat in sorted(cat_lines_map.keys()):
-        if cat not in ordered:
-            ordered[cat] = sorted(cat_lines_map[cat])
-    return ordered
+# classify() cache hits/misses made inside pool workers, summed in the parent
+_worker_cache_stats = Counter()
+
+def _summarize_chunk(chunk, keep_unreconcilable=True):
+    # Only entries cross the process boundary; file paths stay (interned) in the parent.
+    # The worker's cache outlives the task, so report just this chunk's hits/misses.
+    before = _classifier().cache_info()
+    summaries = [summarize_entries(entries, keep_unreconcilable) for entries in chunk]
+    after = _classifier().cache_info()
+    return summaries, after.hits - before.hits, after.misses - before.misses
+
+def _summarize_serial(blocks, keep_unreconcilable):
+    for filepath, entries in blocks:
+        yield (filepath, *summarize_entries(entries, keep_unreconcilable))
+
+def _pop_finished(in_flight):
+    # Wait for the oldest chunk and pair its results with the paths kept in the parent
+    paths, future = in_flight.popleft()
+    summaries, hits, misses = future.result()
+    _worker_cache_stats.update(hits=hits, misses=misses)
+    for filepath, summary in zip(paths, summaries):
+        yield (filepath, *summary)
+
+def summarize_blocks(blocks, keep_unreconcilable=True):
+    """
+    Yields (filepath, cat_lines, unreconcilables) for each (filepath, entries) block, in input
+    order. Small inputs, and machines with a single CPU, are summarized in-process; once
+    PARALLEL_MIN_ENTRIES entries have been seen, chunks of PARALLEL_CHUNK blocks are spread
+    over a process pool. At most PARALLEL_WINDOW chunks per worker are in flight at a time,
+    so the input is still read only as fast as results are consumed.
+    """
+    summarize_chunk = functools.partial(_summarize_chunk, keep_unreconcilable=keep_unreconcilable)
+    blocks = iter(blocks)
+    workers = os.cpu_count() or 1
+    if workers < 2:
+        yield from _summarize_serial(blocks, keep_unreconcilable)
+        return
+    pending = []
+    seen = 0
+    for block in blocks:
+        pending.append(block)
+        seen += len(block[1])
+        if seen >= PARALLEL_MIN_ENTRIES:
+            break
+    else:
+        yield from _summarize_serial(pending, keep_unreconcilable)
+        return
+    # Compile the rules before forking so workers share them instead of each rebuilding.
+    # Only force fork on Linux when nothing else was chosen: macOS defaults to spawn because
+    # forking there can crash inside system frameworks.
+    _classifier()
+    use_fork = sys.platform.startswith("linux") and mp.get_start_method(allow_none=True) in (None, "fork")
+    ctx = mp.get_context("fork") if use_fork else None
+    blocks = chain(pending, blocks)
+    del pending
+    in_flight = deque()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        while chunk := list(islice(blocks, PARALLEL_CHUNK)):
+            paths = [filepath for filepath, _ in chunk]
+            in_flight.append((paths, pool.submit(summarize_chunk, [entries for _, entries in chunk])))
+            if len(in_flight) >= PARALLEL_WINDOW * workers:
+                yield from _pop_finished(in_flight)
+        while in_flight:
+            yield from _pop_finished(in_flight)
+
+def merge_lines(a: array | None, b: array) -> array:
+    """Union two ascending unique line arrays (a may be None), reusing a where possible."""
+    if a is None:
+        return b
+    if a[-1] < b[0]:
+        a.extend(b)
+        return a
+    return array("q", sorted(set(a).union(b)))
+
+def order_categories(cat_lines_map: dict[int, array]) -> dict[int, array]:
+    """Categories in display order (ids already follow it)."""
+    return dict(sorted(cat_lines_map.items()))
 
 
 def summarize(entries):
     """
     Returns: (summary_dict, unreconcilables_list)
-    summary_dict: {category -> sorted set of line numbers}
+    summary_dict: {category name -> array('q') of ascending unique line numbers}
     unreconcilables_list: [(line, msg), ...]
     """
-    cat_lines = defaultdict(set)
-    unreconcilable = []
-    for line, msg in entries:
-        cat = classify(msg)
-        if cat is None:
-            unreconcilable.append((line, msg))
-        else:
-            cat_lines[cat].add(line)
-    cat_lines = {k: sorted(v) for k, v in cat_lines.items()}
-    ordered = OrderedDict()
-    for cat in PREFERRED_ORDER:
-        if cat in cat_lines:
-            ordered[cat] = cat_lines[cat]
-    for cat in sorted(cat_lines.keys()):
-        if cat not in ordered:
-            ordered[cat] = cat_lines[cat]
-    return ordered, unreconcilable
+    cat_lines, unreconcilable = summarize_entries(entries)
+    ordered = order_categories(cat_lines)
+    return {CAT_NAMES[cid]: lines for cid, lines in ordered.items()}, unreconcilable
 
 def format_lines(nums):
-    return ", ".join(str(x) for x in nums)
+    """Comma-join any iterable of line numbers (list, array, ...)."""
+    return ", ".join(map(str, nums))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize long pylint output per file and category.")
+    parser.add_argument("path", nargs="?", default="input.txt",
+                        help="lint output to digest (default: input.txt)")
+    parser.add_argument("--min-errors", type=int, default=1, metavar="N",
+                        help="skip files with fewer than N entries in total, counted across all of "
+                             "their blocks (default: 1)")
+    parser.add_argument("--hide-unrec", action="store_true",
+                        help="don't collect or print unreconcilable messages")
+    return parser.parse_args(argv)
 
 def main():
-    path = sys.argv[1] if len(sys.argv) > 1 else "input.txt"
+    args = parse_args()
+    path = args.path
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            raw = [line.rstrip("\n") for line in f]
+        f = open(path, "rb")
     except FileNotFoundError:
         print(f"ERROR: Could not find '{path}'. Put your lint output there or pass a path.")
         sys.exit(1)
 
-    # Trim any optional header first
-    raw = trim_optional_header(raw)
-
-    # Aggregate across duplicate file blocks
-    per_file_cats: dict[str, dict[str, set[int]]] = defaultdict(lambda: defaultdict(set))
-    per_file_unrec: dict[str, list[tuple[int, str]]] = defaultdict(list)
+    # Aggregate across duplicate file blocks. Unreconcilables are formatted and spooled as
+    # blocks arrive (in memory up to 1 MiB, then a temp file); each file keeps only the
+    # (start, end) byte spans of its lines in the spool.
+    per_file_cats: dict[str, dict[int, array]] = defaultdict(dict)
+    per_file_unrec: dict[str, list[tuple[int, int]]] = defaultdict(list)
+    unrec_spool = tempfile.SpooledTemporaryFile(max_size=1 << 20)
 
     any_blocks = False
-    for filepath, entries in parse_blocks(raw):
-        any_blocks = True
-        cat_lines, unrec = summarize_entries(entries)
-        for cat, lines in cat_lines.items():
-            per_file_cats[filepath][cat].update(lines)        # union by category
-        per_file_unrec[filepath].extend(unrec)                # keep evidence
+    per_file_entries: dict[str, int] = defaultdict(int)
+
+    def wanted(blocks):
+        # Count entries per file as blocks arrive; empty blocks never reach classification
+        nonlocal any_blocks
+        for block in blocks:
+            any_blocks = True
+            if block[1]:
+                per_file_entries[block[0]] += len(block[1])
+                yield block
+
+    with f:  # stream blocks straight off the file; only per-file summaries are kept
+        blocks = wanted(parse_blocks(mapped_lines(f)))
+        for filepath, cat_lines, unrec in summarize_blocks(blocks, not args.hide_unrec):
+            if cat_lines:
+                merged = per_file_cats[filepath]
+                for cat, lines in cat_lines.items():
+                    merged[cat] = merge_lines(merged.get(cat), lines)  # union by category
+            if unrec:                                                   # keep evidence
+                start = unrec_spool.tell()
+                chunk = "".join(f"- {filepath} @ {line}: {msg}\n" for line, msg in unrec)
+                unrec_spool.write(chunk.encode("utf-8"))
+                per_file_unrec[filepath].append((start, unrec_spool.tell()))
 
     if not any_blocks:
         print("No file blocks found. Input should contain lines like: 'path/to/file.py: N errors:'")
         sys.exit(0)
 
-    # Print one merged block per file
-    outputs = []
-    for filepath in sorted(per_file_cats.keys()):
+    # --min-errors applies to each file's total, after its blocks have been merged
+    min_errors = max(args.min_errors, 1)
+    kept = {fp for fp, n in per_file_entries.items() if n >= min_errors}
+
+    # One merged block per file, each written as soon as it is formatted, then the
+    # unreconcilables (grouped by file) copied back out of the spool
+    write = sys.stdout.write
+    for i, filepath in enumerate(sorted(kept.intersection(per_file_cats))):
         ordered = order_categories(per_file_cats[filepath])
-        out = [f"{filepath}:"]
-        for cat, lines in ordered.items():
-            out.append(f"  - {cat} ({len(lines)}): {', '.join(map(str, lines))}")
-        outputs.append("\n".join(out))
-
-    print("\n\n".join(outputs))
-
-    # Print unreconcilables (grouped by file) if any
-    if any(per_file_unrec.values()):
-        print("\n\nunreconcilable messages:")
-        for filepath in sorted(per_file_unrec.keys()):
-            for line, msg in per_file_unrec[filepath]:
-                print(f"- {filepath} @ {line}: {msg}")
+        out = ["\n\n" if i else "", f"{filepath}:"]
+        for cid, lines in ordered.items():
+            out.append(f"\n  - {CAT_NAMES[cid]} ({len(lines)}): {', '.join(map(str, lines))}")
+        write("".join(out))
+    write("\n")
+
+    with unrec_spool:
+        unrec_files = sorted(kept.intersection(per_file_unrec))
+        if unrec_files:
+            write("\n\nunreconcilable messages:\n")
+            for filepath in unrec_files:
+                for start, end in per_file_unrec[filepath]:
+                    unrec_spool.seek(start)
+                    write(unrec_spool.read(end - start).decode("utf-8"))
+
+    if os.environ.get("PYLINT_HELPER_CACHE_STATS"):
+        print(f"classify cache: {classify.cache_info()}", file=sys.stderr)
+        if _worker_cache_stats:
+            print(f"classify cache (pool workers, all combined): hits={_worker_cache_stats['hits']}, "
+                  f"misses={_worker_cache_stats['misses']}", file=sys.stderr)
 
 
 if __name__ == "__main__":